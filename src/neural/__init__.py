@@ -1,3 +1,4 @@
 """Neural Package which contains the Snake Game neural network training functionality."""
 
-from .environment import SnakeGameEnv
+from .environment import RewardConfig, SnakeGameEnv
+from .vector_env import BatchedSnakeEnv
@@ -0,0 +1,207 @@
+"""Finds the fastest DQN training settings for the noodle on this machine."""
+
+import argparse
+import itertools
+import os
+import platform
+import time
+from dataclasses import dataclass
+
+import torch
+
+from src.neural.sweep import available_cores
+from src.neural.train import (
+    DEFAULT_CONFIG_PATH,
+    TrainingConfig,
+    create_dqn_model,
+    create_training_env,
+    save_training_config,
+)
+
+
+@dataclass
+class Measurement:
+    """Throughput measured for one training config."""
+
+    config: TrainingConfig
+    env_steps_per_sec: float
+    updates_per_sec: float
+
+
+def candidate_configs(
+    n_envs: list[int],
+    torch_threads: list[int],
+    batch_sizes: list[int],
+    train_freqs: list[int],
+    replay_ratio: float = TrainingConfig().replay_ratio,
+) -> list[TrainingConfig]:
+    """Returns every combination of the knobs worth measuring.
+
+    Gradient steps are chosen so that every config replays replay_ratio
+    transitions per transition collected. Configs then learn the same
+    amount from the same number of env steps and differ only in speed.
+    Combinations where no whole number of gradient steps gives that ratio,
+    or needing more than twice the available cores, are skipped.
+    """
+    n_cores = len(available_cores())
+    configs = []
+    for envs, threads, batch_size, train_freq in itertools.product(
+        n_envs, torch_threads, batch_sizes, train_freqs
+    ):
+        gradient_steps = replay_ratio * train_freq * envs / batch_size
+        if (
+            gradient_steps >= 1
+            and gradient_steps.is_integer()
+            and envs + threads <= 2 * n_cores
+        ):
+            configs.append(
+                TrainingConfig(
+                    n_envs=envs,
+                    torch_threads=threads,
+                    batch_size=batch_size,
+                    train_freq=train_freq,
+                    gradient_steps=int(gradient_steps),
+                )
+            )
+    return configs
+
+
+def measure(
+    config: TrainingConfig, warmup_steps: int = 1000, trial_steps: int = 5000
+) -> Measurement:
+    """Trains briefly with the config and measures its throughput.
+
+    The warmup starts the env processes and fills the replay buffer past
+    learning_starts, so only steady state training is timed.
+    """
+    if config.torch_threads:
+        torch.set_num_threads(config.torch_threads)
+
+    env = create_training_env(config.n_envs)
+    model = create_dqn_model(
+        env,
+        batch_size=config.batch_size,
+        train_freq=config.train_freq,
+        gradient_steps=config.gradient_steps,
+        learning_starts=warmup_steps // 2,
+    )
+    model.learn(total_timesteps=warmup_steps)
+
+    steps_before = model.num_timesteps
+    updates_before = model._n_updates
+    start = time.perf_counter()
+    model.learn(total_timesteps=trial_steps, reset_num_timesteps=False)
+    elapsed = time.perf_counter() - start
+    env.close()
+
+    return Measurement(
+        config=config,
+        env_steps_per_sec=(model.num_timesteps - steps_before) / elapsed,
+        updates_per_sec=(model._n_updates - updates_before) / elapsed,
+    )
+
+
+def autotune(
+    configs: list[TrainingConfig],
+    warmup_steps: int = 1000,
+    trial_steps: int = 5000,
+) -> list[Measurement]:
+    """Measures every config one at a time and returns them best first.
+
+    Trials run one after another so that each has the machine to itself.
+    Configs are ranked by env steps per second, so with a shared replay
+    ratio the best one reaches a given number of env steps soonest.
+    """
+    measurements = []
+    for i, config in enumerate(configs):
+        measurement = measure(config, warmup_steps, trial_steps)
+        measurements.append(measurement)
+        print(
+            f"[{i + 1}/{len(configs)}] envs {config.n_envs}"
+            + f", threads {config.torch_threads}"
+            + f", batch {config.batch_size}"
+            + f", train freq {config.train_freq}"
+            + f", gradient steps {config.gradient_steps}"
+            + f": {measurement.env_steps_per_sec:.0f} steps/s"
+            + f", {measurement.updates_per_sec:.1f} updates/s"
+        )
+
+    measurements.sort(key=lambda m: m.env_steps_per_sec, reverse=True)
+    return measurements
+
+
+def _powers_of_two(limit: int) -> list[int]:
+    """Returns 1, 2, 4, ... up to and including limit."""
+    values = [1]
+    while values[-1] * 2 <= limit:
+        values.append(values[-1] * 2)
+    return values
+
+
+def main() -> None:
+    n_cores = len(available_cores())
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--envs", type=int, nargs="+", default=_powers_of_two(n_cores)
+    )
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=_powers_of_two(n_cores)
+    )
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[64, 128, 256]
+    )
+    parser.add_argument(
+        "--train-freqs", type=int, nargs="+", default=[1, 2, 4, 8, 16]
+    )
+    parser.add_argument(
+        "--replay-ratio",
+        type=float,
+        default=TrainingConfig().replay_ratio,
+        help="Transitions replayed per transition collected, shared by "
+        "every config",
+    )
+    parser.add_argument("--warmup-steps", type=int, default=1000)
+    parser.add_argument("--trial-steps", type=int, default=5000)
+    parser.add_argument("--output", default=DEFAULT_CONFIG_PATH)
+    args = parser.parse_args()
+
+    # Env processes never open a window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    configs = candidate_configs(
+        args.envs,
+        args.threads,
+        args.batch_sizes,
+        args.train_freqs,
+        args.replay_ratio,
+    )
+    if not configs:
+        parser.error("No combination of the knobs gives that replay ratio")
+    measurements = autotune(configs, args.warmup_steps, args.trial_steps)
+
+    best = measurements[0]
+    save_training_config(
+        best.config,
+        args.output,
+        extra={
+            "replay_ratio": args.replay_ratio,
+            "env_steps_per_sec": round(best.env_steps_per_sec, 1),
+            "updates_per_sec": round(best.updates_per_sec, 1),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cores": n_cores,
+        },
+    )
+    print(
+        f"Recommended envs {best.config.n_envs}"
+        + f", threads {best.config.torch_threads}"
+        + f", batch {best.config.batch_size}"
+        + f", train freq {best.config.train_freq}"
+        + f", gradient steps {best.config.gradient_steps}"
+        + f" written to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
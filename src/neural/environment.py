@@ -1,13 +1,34 @@
 """Snake Game wrapper over Gymnasium environment."""
 import copy
+from dataclasses import dataclass
 
 import gymnasium as gym
 import numpy as np
 import pygame
 from gymnasium import spaces
 
+from src.neural.flood_fill import ReachableArea
 from src.noodle import Controller, Model, View
-from src.noodle.model import Direction
+from src.noodle.model import Direction, Point
+
+# Cell offsets (x, y) of a move in each direction
+_DELTAS = {
+    Direction.UP: (0, -1),
+    Direction.RIGHT: (1, 0),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+}
+
+
+@dataclass(frozen=True)
+class RewardConfig:
+    """Reward shaping settings for the Snake Game environment."""
+
+    death: float = -10.0
+    starvation: float = -10.0
+    fruit: float = 10.0
+    survive: float = 1.0
+    starvation_limit: int = 50
 
 
 class SnakeGameEnv(gym.Env):
@@ -21,6 +42,10 @@ class SnakeGameEnv(gym.Env):
         height: int = 400,
         cell_size: int = 25,
         fps: int = 120,
+        rewards: RewardConfig | None = None,
+        verbose: bool = True,
+        reachable_area: bool = False,
+        safety_shield: bool = False,
     ) -> None:
         super(SnakeGameEnv, self).__init__()
 
@@ -28,10 +53,18 @@ class SnakeGameEnv(gym.Env):
         self.height: int = height
         self.cell_size: int = cell_size
         self.fps: int = fps
+        self.rewards: RewardConfig = rewards or RewardConfig()
+        self.verbose: bool = verbose
+        self.reachable_area: bool = reachable_area
+        self.safety_shield: bool = safety_shield
 
         self.model: Model = Model(self.width, self.height, self.cell_size)
         self.view: View = View(self.width, self.height, self.cell_size)
 
+        self.cols: int = self.width // self.cell_size
+        self.rows: int = self.height // self.cell_size
+        self._regions: ReachableArea = ReachableArea(self.cols, self.rows)
+
         # Action space: 0 - UP, 1 - RIGHT, 2 - DOWN, 3 - LEFT
         self.action_space: gym.Space = spaces.Discrete(4)
 
@@ -39,8 +72,11 @@ class SnakeGameEnv(gym.Env):
         # 1. Direction (0: UP, 1: RIGHT, 2: DOWN, 3: LEFT)
         # 2. Distance to wall or body in 4 directions (up, right, down, left)
         # 3. Distance to fruit (Manhattan distance)
+        # 4. Optionally, free cells reachable after each move (up, right,
+        #    down, left)
+        n_features = 10 if self.reachable_area else 6
         self.observation_space: gym.Space = spaces.Box(
-            low=-np.inf, high=np.inf, shape=(6,), dtype=np.float32
+            low=-np.inf, high=np.inf, shape=(n_features,), dtype=np.float32
         )
 
         self.controller: Controller = Controller(
@@ -53,7 +89,9 @@ class SnakeGameEnv(gym.Env):
         """Reset the environment to the initial state."""
         super().reset(seed=seed)
 
-        self.model.reset()
+        self.model.reset(seed=seed)
+        if self._tracks_regions():
+            self._reset_regions()
 
         obs = self._get_observation()
         return obs, {}
@@ -63,6 +101,10 @@ class SnakeGameEnv(gym.Env):
         Apply action, update the game state,
         and return the necessary Gym output.
         """
+        # Steer away from moves that would trap the snake
+        if self.safety_shield and not self.action_masks()[action]:
+            action = int(np.argmax(self._get_reachable_areas()))
+
         # Update direction based on action (0: UP, 1: RIGHT, 2: DOWN, 3: LEFT)
         if action == 0:
             direction = Direction.UP
@@ -75,35 +117,41 @@ class SnakeGameEnv(gym.Env):
 
         prev_state = copy.deepcopy(self.model.state)
         curr_state = self.model.play_step(direction)
+        if self._tracks_regions():
+            self._update_regions()
         obs = self._get_observation()
 
         truncated = False
         terminated = False
+        starvation_limit = self.rewards.starvation_limit
         # Game over if collision occurs
         if curr_state.done:
-            reward = -10.0
+            reward = self.rewards.death
             terminated = True
-        # Game over if snake hasn't eaten for 50 turns (time truncation)
-        elif curr_state.turns_since_ate >= 50:
-            print("Game over: 50 turns without eating.")
-            reward = -10.0
+        # Game over if snake hasn't eaten for too long (time truncation)
+        elif curr_state.turns_since_ate >= starvation_limit:
+            if self.verbose:
+                print(f"Game over: {starvation_limit} turns without eating.")
+            reward = self.rewards.starvation
             terminated = True
             truncated = True
         # Reward for eating
         elif curr_state.fruits_eaten > prev_state.fruits_eaten:
-            reward = 10.0
+            reward = self.rewards.fruit
         else:
-            reward = 1
+            reward = self.rewards.survive
 
-        info = {}
+        # The action actually applied, which differs when shielded
+        info = {"action": action}
 
         # Debugging output to track actions and game state
-        print(
-            f"Action: {action}, Reward: {reward}"
-            + f", Turns since ate: {curr_state.turns_since_ate}"
-            + f", Done: {curr_state.done}"
-            + f", Fruits eaten: {curr_state.fruits_eaten}"
-        )
+        if self.verbose:
+            print(
+                f"Action: {action}, Reward: {reward}"
+                + f", Turns since ate: {curr_state.turns_since_ate}"
+                + f", Done: {curr_state.done}"
+                + f", Fruits eaten: {curr_state.fruits_eaten}"
+            )
 
         return obs, reward, terminated, truncated, info
 
@@ -117,6 +165,25 @@ class SnakeGameEnv(gym.Env):
         """Close the game (e.g., the Pygame window)."""
         pygame.quit()
 
+    def action_masks(self) -> np.ndarray:
+        """
+        Return which actions leave the snake enough room to survive.
+
+        An action is safe when the free region left after the move can hold
+        the whole snake. If no action is safe, the actions leading into the
+        largest region are allowed.
+        """
+        if not self._tracks_regions():
+            raise RuntimeError(
+                "Action masks need reachable_area or safety_shield enabled."
+            )
+
+        areas = self._get_reachable_areas()
+        safe = areas >= len(self.model.snake.segments())
+        if not safe.any():
+            safe = areas == areas.max()
+        return safe
+
     def _get_observation(self) -> np.ndarray:
         """Direction, distance to danger, and distance to fruit."""
         direction = (
@@ -125,22 +192,23 @@ class SnakeGameEnv(gym.Env):
         distances_to_danger = self._get_distances_to_danger()
         distance_to_fruit = self.model.state.distance_to_fruit
 
-        observation = np.array(
-            [direction] + distances_to_danger + [distance_to_fruit],
-            dtype=np.float32,
-        )
+        features = [direction] + distances_to_danger + [distance_to_fruit]
+        if self.reachable_area:
+            features += self._get_reachable_areas().tolist()
+        observation = np.array(features, dtype=np.float32)
 
         # Human-readable printout of the observation with consistent spacing
-        direction_labels = ["UP", "RIGHT", "DOWN", "LEFT"]
-        print(
-            f"{'Direction:':<10} {direction_labels[direction]:<6}"
-            f"{'Distance to danger:':<20}"
-            f"{'Up':<3}{distances_to_danger[0]:<3.0f} "
-            f"{'Right':<6}{distances_to_danger[1]:<3.0f} "
-            f"{'Down':<5}{distances_to_danger[2]:<3.0f} "
-            f"{'Left':<5}{distances_to_danger[3]:<3.0f}"
-            f"{'Distance to fruit:':<18} {distance_to_fruit:.0f}"
-        )
+        if self.verbose:
+            direction_labels = ["UP", "RIGHT", "DOWN", "LEFT"]
+            print(
+                f"{'Direction:':<10} {direction_labels[direction]:<6}"
+                f"{'Distance to danger:':<20}"
+                f"{'Up':<3}{distances_to_danger[0]:<3.0f} "
+                f"{'Right':<6}{distances_to_danger[1]:<3.0f} "
+                f"{'Down':<5}{distances_to_danger[2]:<3.0f} "
+                f"{'Left':<5}{distances_to_danger[3]:<3.0f}"
+                f"{'Distance to fruit:':<18} {distance_to_fruit:.0f}"
+            )
 
         return observation
 
@@ -183,3 +251,61 @@ class SnakeGameEnv(gym.Env):
             float(distance_down),
             float(distance_left),
         ]
+
+    def _get_reachable_areas(self) -> np.ndarray:
+        """
+        Calculate how many free cells stay reachable after each move.
+
+        The tail is counted as free when it moves out as the head moves in,
+        which is not the case while the snake is still growing.
+        Reversing is ignored by the snake, so it scores as going straight.
+        """
+        head = self.model.snake.head()
+        current = self.model.snake.direction()
+        x = head.x // self.cell_size
+        y = head.y // self.cell_size
+
+        areas = np.zeros(4, dtype=np.float32)
+        for direction in Direction:
+            if (direction.value - current.value) % 4 == 2:
+                dx, dy = _DELTAS[current]
+            else:
+                dx, dy = _DELTAS[direction]
+
+            if 0 <= x + dx < self.cols and 0 <= y + dy < self.rows:
+                cell = (y + dy) * self.cols + (x + dx)
+                # The cell moved into is taken by the head
+                areas[direction.value] = max(
+                    0, self._regions.region_size(cell) - 1
+                )
+        return areas
+
+    def _tracks_regions(self) -> bool:
+        """Whether the free regions of the board need to be maintained."""
+        return self.reachable_area or self.safety_shield
+
+    def _reset_regions(self) -> None:
+        """Rebuild the free regions from the current snake."""
+        self._regions.reset(
+            self._to_cell(s) for s in self.model.snake.segments()
+        )
+        self._sync_tail()
+
+    def _update_regions(self) -> None:
+        """Occupy the new head and release the tail if it moves out next."""
+        head = self.model.snake.head()
+        if 0 <= head.x < self.width and 0 <= head.y < self.height:
+            self._regions.occupy(self._to_cell(head))
+        self._sync_tail()
+
+    def _sync_tail(self) -> None:
+        """Count the tail as free only when the next move pops it."""
+        snake = self.model.snake
+        if len(snake.segments()) == snake.length():
+            self._regions.release(self._to_cell(snake.tail()))
+
+    def _to_cell(self, point: Point) -> int:
+        """Flat cell index of a point on the board."""
+        return (point.y // self.cell_size) * self.cols + (
+            point.x // self.cell_size
+        )
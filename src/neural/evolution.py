@@ -0,0 +1,242 @@
+"""Trains the noodle with a gradient-free evolution strategy."""
+
+import argparse
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import torch
+
+from src.neural import RewardConfig
+from src.neural.sweep import available_cores
+from src.neural.vector_env import BatchedSnakeEnv
+
+N_INPUTS = 6
+N_ACTIONS = 4
+
+
+def mlp_shapes(net_arch: list[int]) -> list[tuple[int, int]]:
+    """Returns the (inputs, outputs) shape of every layer of the MLP."""
+    sizes = [N_INPUTS] + list(net_arch) + [N_ACTIONS]
+    return list(zip(sizes[:-1], sizes[1:]))
+
+
+def count_params(net_arch: list[int]) -> int:
+    """Returns the number of weights and biases in the MLP."""
+    return sum(n_in * n_out + n_out for n_in, n_out in mlp_shapes(net_arch))
+
+
+def init_params(net_arch: list[int], rng: np.random.Generator) -> np.ndarray:
+    """Returns flat MLP parameters using PyTorch's default linear init."""
+    params = []
+    for n_in, n_out in mlp_shapes(net_arch):
+        bound = 1.0 / np.sqrt(n_in)
+        params.append(rng.uniform(-bound, bound, n_in * n_out + n_out))
+    return np.concatenate(params).astype(np.float32)
+
+
+def unflatten_population(
+    population: torch.Tensor, net_arch: list[int]
+) -> list[tuple[torch.Tensor, torch.Tensor]]:
+    """Splits (population, params) into stacked per-layer weights.
+
+    Each layer becomes a weight tensor of shape (population, inputs,
+    outputs) and a bias tensor of shape (population, 1, outputs).
+    """
+    layers = []
+    offset = 0
+    for n_in, n_out in mlp_shapes(net_arch):
+        weight = population[:, offset : offset + n_in * n_out]
+        offset += n_in * n_out
+        bias = population[:, offset : offset + n_out]
+        offset += n_out
+        layers.append(
+            (weight.reshape(-1, n_in, n_out), bias.reshape(-1, 1, n_out))
+        )
+    return layers
+
+
+def batched_forward(
+    layers: list[tuple[torch.Tensor, torch.Tensor]], obs: torch.Tensor
+) -> torch.Tensor:
+    """Runs every individual's MLP on its own boards in one pass.
+
+    obs has shape (population, boards, inputs), and the result has shape
+    (population, boards, actions).
+    """
+    x = obs
+    for i, (weight, bias) in enumerate(layers):
+        x = torch.baddbmm(bias, x, weight)
+        if i < len(layers) - 1:
+            x = torch.relu(x)
+    return x
+
+
+def evaluate_population(
+    population: np.ndarray,
+    net_arch: list[int],
+    episodes: int = 4,
+    max_steps: int = 1000,
+    rewards: RewardConfig | None = None,
+    seed: int | None = None,
+) -> np.ndarray:
+    """Returns the mean episode reward of every individual.
+
+    All individuals play their episodes at the same time: the boards of the
+    whole population are advanced together and each step needs a single
+    batched forward pass.
+    """
+    size = len(population)
+    # Board (i, e) uses fruit stream e, so episode e has the same fruit
+    # for every individual
+    env = BatchedSnakeEnv(
+        size * episodes, rewards=rewards, seed=seed, fruit_streams=episodes
+    )
+    obs = env.reset()
+    returns = np.zeros(size * episodes, dtype=np.float64)
+
+    with torch.no_grad():
+        layers = unflatten_population(torch.from_numpy(population), net_arch)
+        for _ in range(max_steps):
+            q_values = batched_forward(
+                layers, torch.from_numpy(obs).view(size, episodes, N_INPUTS)
+            )
+            actions = q_values.argmax(dim=2).view(-1).numpy()
+            obs, reward, _, _, _ = env.step(actions)
+            returns += reward
+            if env.done.all():
+                break
+
+    return returns.reshape(size, episodes).mean(axis=1)
+
+
+def centered_ranks(fitness: np.ndarray) -> np.ndarray:
+    """Maps fitness to ranks spread evenly over [-0.5, 0.5].
+
+    Tied fitness values share their average rank, so mirrored pairs that
+    score the same cancel out in the update.
+    """
+    ranks = np.empty(len(fitness), dtype=np.float64)
+    ranks[fitness.argsort()] = np.arange(len(fitness))
+    _, ties = np.unique(fitness, return_inverse=True)
+    ranks = (np.bincount(ties, ranks) / np.bincount(ties))[ties]
+    return ranks / (len(fitness) - 1) - 0.5
+
+
+def train_snake_evolution(
+    generations: int = 200,
+    population_size: int = 64,
+    sigma: float = 0.05,
+    learning_rate: float = 0.02,
+    episodes: int = 4,
+    max_steps: int = 1000,
+    net_arch: list[int] | None = None,
+    rewards: RewardConfig | None = None,
+    n_workers: int | None = None,
+    seed: int = 0,
+    save_path: str = "es_snake.pth",
+) -> np.ndarray:
+    """Trains the MLP with an evolution strategy and returns its weights.
+
+    Every generation samples mirrored perturbations of the current weights,
+    evaluates the whole population across worker processes and moves the
+    weights along the rank-weighted perturbations.
+    """
+    net_arch = net_arch or [256, 256]
+    n_workers = n_workers or len(available_cores())
+    rng = np.random.default_rng(seed)
+
+    half = max(1, population_size // 2)
+    params = init_params(net_arch, rng)
+    best_params, best_fitness = params.copy(), -np.inf
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=torch.set_num_threads, initargs=(1,)
+    ) as executor:
+        for generation in range(generations):
+            # Mirrored sampling halves the variance of the update
+            noise = rng.standard_normal((half, len(params)), dtype=np.float32)
+            population = np.concatenate(
+                [params + sigma * noise, params - sigma * noise]
+            )
+
+            # Every chunk uses the same seed, so episode e has the same fruit
+            # for the whole population and mirrored pairs face equal luck
+            chunks = np.array_split(population, n_workers)
+            futures = [
+                executor.submit(
+                    evaluate_population,
+                    chunk,
+                    net_arch,
+                    episodes,
+                    max_steps,
+                    rewards,
+                    seed + generation,
+                )
+                for chunk in chunks
+                if len(chunk)
+            ]
+            fitness = np.concatenate([future.result() for future in futures])
+
+            if fitness.max() > best_fitness:
+                best_fitness = float(fitness.max())
+                best_params = population[fitness.argmax()].copy()
+
+            ranks = centered_ranks(fitness)
+            step = (ranks[:half] - ranks[half:]) @ noise
+            params += learning_rate / (2 * half * sigma) * step
+
+            print(
+                f"Generation {generation}: mean fitness {fitness.mean():.2f}"
+                + f", max fitness {fitness.max():.2f}"
+                + f", best so far {best_fitness:.2f}"
+            )
+
+    torch.save(
+        {"net_arch": net_arch, "params": torch.from_numpy(best_params)},
+        save_path,
+    )
+    return best_params
+
+
+def load_evolution_policy(path: str) -> Callable[[np.ndarray], int]:
+    """Loads weights saved by train_snake_evolution as a greedy policy."""
+    checkpoint = torch.load(path)
+    layers = unflatten_population(
+        checkpoint["params"][None], checkpoint["net_arch"]
+    )
+
+    def policy(obs: np.ndarray) -> int:
+        obs = torch.as_tensor(obs, dtype=torch.float32).view(1, 1, N_INPUTS)
+        with torch.no_grad():
+            return int(batched_forward(layers, obs).argmax())
+
+    return policy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--generations", type=int, default=200)
+    parser.add_argument("--population", type=int, default=64)
+    parser.add_argument("--sigma", type=float, default=0.05)
+    parser.add_argument("--learning-rate", type=float, default=0.02)
+    parser.add_argument("--episodes", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="es_snake.pth")
+    args = parser.parse_args()
+
+    train_snake_evolution(
+        generations=args.generations,
+        population_size=args.population,
+        sigma=args.sigma,
+        learning_rate=args.learning_rate,
+        episodes=args.episodes,
+        n_workers=args.workers,
+        seed=args.seed,
+        save_path=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
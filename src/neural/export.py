@@ -0,0 +1,217 @@
+"""Offscreen video export of noodle episodes."""
+
+import argparse
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+from stable_baselines3 import DQN
+
+from src.neural import SnakeGameEnv
+from src.neural.evolution import load_evolution_policy
+from src.noodle import Model
+from src.noodle.model import Direction
+from src.noodle.view import Rasterizer
+
+
+@dataclass
+class Episode:
+    """A replayable episode: the reset seed and the actions taken."""
+
+    seed: int
+    actions: list[int] = field(default_factory=list)
+
+
+def record_episode(
+    env: SnakeGameEnv,
+    policy: Callable[[np.ndarray], int],
+    seed: int,
+    max_steps: int = 10000,
+) -> Episode:
+    """Plays one episode in a live environment and records it."""
+    episode = Episode(seed=seed)
+    obs, _ = env.reset(seed=seed)
+    for _ in range(max_steps):
+        obs, _, terminated, truncated, info = env.step(int(policy(obs)))
+        # Record what was applied, in case the safety shield stepped in
+        episode.actions.append(int(info["action"]))
+        if terminated or truncated:
+            break
+    return episode
+
+
+def replay_cells(
+    episode: Episode,
+    width: int = 400,
+    height: int = 400,
+    cell_size: int = 25,
+    batch_size: int = 64,
+) -> Iterator[np.ndarray]:
+    """Replays an episode and yields batches of cell label grids.
+
+    The first grid is the state after reset, followed by one grid per
+    action. Each yielded array has shape (batch, rows, cols) and is reused
+    for the next batch, so it must be consumed before advancing.
+    """
+    model = Model(width, height, cell_size)
+    model.reset(seed=episode.seed)
+    rasterizer = Rasterizer(width, height, cell_size)
+
+    batch = np.empty(
+        (batch_size, rasterizer.rows, rasterizer.cols), dtype=np.uint8
+    )
+    batch[0] = rasterizer.cells(model.snake, model.fruit)
+    filled = 1
+
+    for action in episode.actions:
+        if filled == batch_size:
+            yield batch
+            filled = 0
+
+        state = model.play_step(Direction(action))
+        batch[filled] = rasterizer.cells(model.snake, model.fruit)
+        filled += 1
+
+        if state.done:
+            break
+
+    yield batch[:filled]
+
+
+def export_episode(
+    episode: Episode,
+    path: str,
+    width: int = 400,
+    height: int = 400,
+    cell_size: int = 25,
+    fps: int = 15,
+    batch_size: int = 64,
+) -> str:
+    """Renders an episode offscreen and writes it to a GIF or MP4 file."""
+    try:
+        import imageio.v2 as imageio
+    except ImportError as error:
+        raise ImportError(
+            "Video export requires imageio, install it with the video "
+            "extra: poetry install -E video"
+        ) from error
+
+    if path.lower().endswith(".gif"):
+        writer_kwargs = dict(duration=1000 / fps, loop=0)
+    else:
+        writer_kwargs = dict(fps=fps, macro_block_size=1)
+
+    rasterizer = Rasterizer(width, height, cell_size)
+    with imageio.get_writer(path, mode="I", **writer_kwargs) as writer:
+        for cells in replay_cells(
+            episode, width, height, cell_size, batch_size
+        ):
+            for frame in rasterizer.render(cells):
+                writer.append_data(frame)
+
+    return path
+
+
+def export_episodes(
+    episodes: list[Episode],
+    output_dir: str,
+    video_format: str = "gif",
+    width: int = 400,
+    height: int = 400,
+    cell_size: int = 25,
+    fps: int = 15,
+    batch_size: int = 64,
+    n_workers: int | None = None,
+) -> list[str]:
+    """Exports many episodes in parallel, one file per episode."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = [
+        os.path.join(
+            output_dir, f"episode_{i:04d}_seed_{e.seed}.{video_format}"
+        )
+        for i, e in enumerate(episodes)
+    ]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(
+                export_episode,
+                episode,
+                path,
+                width,
+                height,
+                cell_size,
+                fps,
+                batch_size,
+            )
+            for episode, path in zip(episodes, paths)
+        ]
+        return [future.result() for future in futures]
+
+
+def _load_policy(
+    algorithm: str, path: str | None
+) -> Callable[[np.ndarray], int]:
+    """Loads a trained model as a greedy policy."""
+    if algorithm == "es":
+        return load_evolution_policy(path or "es_snake.pth")
+
+    model = DQN.load(path or "dqn_snake")
+
+    def policy(obs: np.ndarray) -> int:
+        action, _ = model.predict(obs, deterministic=True)
+        return int(action)
+
+    return policy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--model",
+        default=None,
+        help="Path to a saved model (dqn_snake or es_snake.pth by default)",
+    )
+    parser.add_argument(
+        "--algorithm",
+        choices=["dqn", "es"],
+        default="dqn",
+        help="Whether the model was trained by train.py or evolution.py",
+    )
+    parser.add_argument("--episodes", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0, help="First seed")
+    parser.add_argument("--output-dir", default="videos")
+    parser.add_argument("--format", choices=["gif", "mp4"], default="gif")
+    parser.add_argument("--fps", type=int, default=15)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    # Recording only steps the game, so no window is ever needed
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    policy = _load_policy(args.algorithm, args.model)
+    env = SnakeGameEnv(verbose=False)
+
+    episodes = [
+        record_episode(env, policy, seed)
+        for seed in range(args.seed, args.seed + args.episodes)
+    ]
+    env.close()
+
+    paths = export_episodes(
+        episodes,
+        args.output_dir,
+        video_format=args.format,
+        width=env.width,
+        height=env.height,
+        cell_size=env.cell_size,
+        fps=args.fps,
+        n_workers=args.workers,
+    )
+    print(f"Exported {len(paths)} episodes to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
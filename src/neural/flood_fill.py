@@ -0,0 +1,172 @@
+"""Incrementally maintained regions of free cells on the Snake board."""
+
+from collections import deque
+from collections.abc import Iterable
+
+
+class ReachableArea:
+    """Tracks the connected regions of free cells as cells change.
+
+    Cells are flat indices (y * cols + x). Every free cell carries a region
+    label, and labels are merged with a union-find when a released cell
+    joins regions together. Occupying a cell can only split its region if
+    the free cells around it are not already connected locally; only then
+    is that region flood filled again.
+    """
+
+    def __init__(self, cols: int, rows: int) -> None:
+        self.cols = cols
+        self.rows = rows
+        self._n_cells = cols * rows
+
+        self._neighbours: list[list[int]] = []
+        self._rings: list[list[int]] = []
+        # Ring order is N, NE, E, SE, S, SW, W, NW so even entries are the
+        # orthogonal neighbours
+        ring_offsets = [
+            (0, -1),
+            (1, -1),
+            (1, 0),
+            (1, 1),
+            (0, 1),
+            (-1, 1),
+            (-1, 0),
+            (-1, -1),
+        ]
+        for cell in range(self._n_cells):
+            x, y = cell % cols, cell // cols
+            ring = [
+                (y + dy) * cols + (x + dx)
+                if 0 <= x + dx < cols and 0 <= y + dy < rows
+                else -1
+                for dx, dy in ring_offsets
+            ]
+            self._rings.append(ring)
+            self._neighbours.append([c for c in ring[::2] if c >= 0])
+
+        self.reset()
+
+    def reset(self, occupied: Iterable[int] = ()) -> None:
+        """Labels every region from scratch, given the occupied cells."""
+        self._label = [0] * self._n_cells
+        for cell in occupied:
+            self._label[cell] = -1
+        self._parent: list[int] = []
+        self._size: list[int] = []
+
+        # Label 0 marks free cells that have not been reached yet
+        self._new_label(0)
+        for cell in range(self._n_cells):
+            if self._label[cell] == 0:
+                self._flood(cell, 1)
+
+    def is_free(self, cell: int) -> bool:
+        """Returns whether the cell is free."""
+        return self._label[cell] >= 0
+
+    def region_size(self, cell: int) -> int:
+        """Returns the number of free cells in the cell's region."""
+        if self._label[cell] < 0:
+            return 0
+        return self._size[self._find(self._label[cell])]
+
+    def release(self, cell: int) -> None:
+        """Marks the cell as free, joining the regions around it."""
+        if self._label[cell] >= 0:
+            return
+
+        roots = {
+            self._find(self._label[n])
+            for n in self._neighbours[cell]
+            if self._label[n] >= 0
+        }
+        if not roots:
+            self._label[cell] = self._new_label(1)
+            return
+
+        # Union by size into the largest neighbouring region
+        root = max(roots, key=lambda r: self._size[r])
+        for other in roots - {root}:
+            self._parent[other] = root
+            self._size[root] += self._size[other]
+        self._size[root] += 1
+        self._label[cell] = root
+
+    def occupy(self, cell: int) -> None:
+        """Marks the cell as occupied, splitting its region if needed."""
+        if self._label[cell] < 0:
+            return
+
+        root = self._find(self._label[cell])
+        self._label[cell] = -1
+        self._size[root] -= 1
+
+        if self._local_groups(cell) <= 1:
+            return
+
+        # The region may have been cut in two: relabel each side that the
+        # free neighbours lead into
+        start = len(self._parent)
+        for neighbour in self._neighbours[cell]:
+            label = self._label[neighbour]
+            if 0 <= label < start:
+                self._flood(neighbour, start)
+
+        # Relabel everything once dead labels outnumber the cells
+        if len(self._parent) > 4 * self._n_cells:
+            self.reset(
+                [c for c in range(self._n_cells) if self._label[c] < 0]
+            )
+
+    def _local_groups(self, cell: int) -> int:
+        """Counts free orthogonal neighbours not connected around the cell.
+
+        Two orthogonal neighbours are connected locally when the diagonal
+        cell between them is free too.
+        """
+        ring = self._rings[cell]
+        free = [c >= 0 and self._label[c] >= 0 for c in ring]
+
+        groups = 0
+        for i in range(0, 8, 2):
+            if free[i] and not (free[i - 1] and free[i - 2]):
+                groups += 1
+        # Every neighbour is free and connected all the way around
+        if groups == 0 and any(free[::2]):
+            groups = 1
+        return groups
+
+    def _flood(self, cell: int, min_label: int) -> None:
+        """Gives the region around the cell a new label.
+
+        Free cells already carrying a label of min_label or above have been
+        relabelled and are not visited again.
+        """
+        label = self._new_label(0)
+        self._label[cell] = label
+        size = 1
+
+        queue = deque([cell])
+        while queue:
+            current = queue.popleft()
+            for neighbour in self._neighbours[current]:
+                if 0 <= self._label[neighbour] < min_label:
+                    self._label[neighbour] = label
+                    size += 1
+                    queue.append(neighbour)
+
+        self._size[label] = size
+
+    def _new_label(self, size: int) -> int:
+        """Creates a new region label of the given size."""
+        self._parent.append(len(self._parent))
+        self._size.append(size)
+        return len(self._parent) - 1
+
+    def _find(self, label: int) -> int:
+        """Returns the root label of a region, halving paths on the way."""
+        parent = self._parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
@@ -0,0 +1,435 @@
+"""Parallel hyperparameter and reward-shaping sweeps for the noodle."""
+
+import argparse
+import csv
+import dataclasses
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any
+
+from stable_baselines3 import DQN
+from stable_baselines3.common.callbacks import BaseCallback
+
+from src.neural import RewardConfig, SnakeGameEnv
+
+# Candidate values for every setting the sweep can vary. Keys that match a
+# field of RewardConfig shape the environment rewards, the rest are passed to
+# create_dqn_model.
+SEARCH_SPACE: dict[str, list[Any]] = {
+    "death": [-10.0, -20.0, -5.0],
+    "fruit": [10.0, 20.0],
+    "survive": [1.0, 0.1, 0.0],
+    "starvation_limit": [50, 100],
+    "learning_rate": [1e-3, 5e-4, 1e-4],
+    "batch_size": [64, 128],
+    "exploration_fraction": [0.4, 0.2],
+    "target_update_interval": [1000, 5000],
+}
+
+REWARD_KEYS = {f.name for f in dataclasses.fields(RewardConfig)}
+
+
+@dataclass
+class TrialResult:
+    """Outcome of a single sweep trial."""
+
+    trial_id: int
+    params: dict[str, Any]
+    score: float = 0.0
+    best_score: float = 0.0
+    timesteps: int = 0
+    stopped_early: bool = False
+    seconds: float = 0.0
+    scores: list[float] = field(default_factory=list)
+
+
+def grid_search(space: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Returns every combination of the values in the search space."""
+    keys = list(space)
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*(space[key] for key in keys))
+    ]
+
+
+def random_search(
+    space: dict[str, list[Any]], n_trials: int, seed: int | None = None
+) -> list[dict[str, Any]]:
+    """Returns n_trials random samples from the search space."""
+    rng = random.Random(seed)
+    return [
+        {key: rng.choice(values) for key, values in space.items()}
+        for _ in range(n_trials)
+    ]
+
+
+def available_cores() -> list[int]:
+    """Returns the CPU cores this process is allowed to run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def run_sweep(
+    trials: list[dict[str, Any]],
+    timesteps: int = 50000,
+    eval_interval: int = 5000,
+    n_eval_episodes: int = 5,
+    n_workers: int | None = None,
+    threads_per_worker: int = 1,
+    min_reports: int = 3,
+    stop_quantile: float = 0.25,
+) -> list[TrialResult]:
+    """Runs the trials across a process pool and returns ranked results.
+
+    Every eval_interval timesteps a trial reports its score to a shared
+    board. Once at least min_reports trials have reached the same checkpoint,
+    a trial scoring below the stop_quantile of its peers is stopped so its
+    worker can move on to the next trial.
+
+    Completed trials are ranked by their final score. Stopped trials follow,
+    as they lost at a checkpoint, ranked by the last score they reached.
+    """
+    cores = available_cores()
+    threads_per_worker = max(1, min(threads_per_worker, len(cores)))
+    if n_workers is None:
+        n_workers = max(1, len(cores) // threads_per_worker)
+
+    results = []
+    with mp.Manager() as manager:
+        # Hand each worker its own slice of cores to pin itself to
+        core_slices = manager.Queue()
+        for worker in range(n_workers):
+            start = (worker * threads_per_worker) % len(cores)
+            core_slices.put(
+                [
+                    cores[(start + i) % len(cores)]
+                    for i in range(threads_per_worker)
+                ]
+            )
+
+        board = manager.dict()
+        lock = manager.Lock()
+
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(threads_per_worker, core_slices),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _run_trial,
+                    trial_id,
+                    params,
+                    timesteps,
+                    eval_interval,
+                    n_eval_episodes,
+                    board,
+                    lock,
+                    min_reports,
+                    stop_quantile,
+                )
+                for trial_id, params in enumerate(trials)
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                status = "stopped" if result.stopped_early else "done"
+                print(
+                    f"Trial {result.trial_id} {status} after "
+                    f"{result.timesteps} steps, score {result.score:.2f}"
+                )
+
+    results.sort(key=_rank_key)
+    return results
+
+
+def print_results(results: list[TrialResult]) -> None:
+    """Prints the sweep results as a table, in ranked order."""
+    keys = _param_keys(results)
+    header = ["trial", "last", "best", "steps", "early"] + keys
+    rows = [
+        [
+            str(result.trial_id),
+            f"{result.score:.2f}",
+            f"{result.best_score:.2f}",
+            str(result.timesteps),
+            "yes" if result.stopped_early else "no",
+        ]
+        + [str(result.params.get(key, "")) for key in keys]
+        for result in results
+    ]
+
+    widths = [
+        max(len(row[i]) for row in [header] + rows) for i in range(len(header))
+    ]
+    for row in [header] + rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+def save_results(results: list[TrialResult], path: str) -> None:
+    """Writes the sweep results to a CSV file."""
+    keys = _param_keys(results)
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(
+            [
+                "trial_id",
+                "score",
+                "best_score",
+                "timesteps",
+                "stopped_early",
+                "seconds",
+            ]
+            + keys
+        )
+        for result in results:
+            writer.writerow(
+                [
+                    result.trial_id,
+                    result.score,
+                    result.best_score,
+                    result.timesteps,
+                    result.stopped_early,
+                    round(result.seconds, 2),
+                ]
+                + [result.params.get(key, "") for key in keys]
+            )
+
+
+def _rank_key(result: TrialResult) -> tuple[bool, int, float]:
+    """Sorts completed trials first, then later stops, by last score."""
+    return (result.stopped_early, -result.timesteps, -result.score)
+
+
+def _param_keys(results: list[TrialResult]) -> list[str]:
+    """Returns the union of parameter names across results, in order."""
+    return list(dict.fromkeys(key for r in results for key in r.params))
+
+
+def _init_worker(threads: int, core_slices: "queue.Queue[list[int]]") -> None:
+    """Pins the worker to its cores and limits its torch threads."""
+    # Workers never open a window, but the View still needs a video driver
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    try:
+        cores = core_slices.get_nowait()
+    except queue.Empty:
+        cores = []
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+
+    import torch
+
+    torch.set_num_threads(threads)
+
+
+def _run_trial(
+    trial_id: int,
+    params: dict[str, Any],
+    timesteps: int,
+    eval_interval: int,
+    n_eval_episodes: int,
+    board: dict[int, list[float]],
+    lock: Any,
+    min_reports: int,
+    stop_quantile: float,
+) -> TrialResult:
+    """Trains and periodically evaluates one configuration."""
+    from src.neural.train import create_dqn_model, create_snake_env
+
+    start = time.perf_counter()
+    result = TrialResult(trial_id=trial_id, params=params)
+
+    rewards = RewardConfig(
+        **{key: value for key, value in params.items() if key in REWARD_KEYS}
+    )
+    dqn_kwargs = {
+        key: value for key, value in params.items() if key not in REWARD_KEYS
+    }
+
+    env = create_snake_env(rewards=rewards, verbose=False)
+    # Every trial is scored under the same default rules
+    eval_env = create_snake_env(verbose=False)
+    model = create_dqn_model(env, seed=trial_id, **dqn_kwargs)
+
+    # A single learn call keeps the exploration schedule spread over the
+    # whole trial; the callback evaluates and stops losing trials
+    callback = _CheckpointCallback(
+        result,
+        eval_env,
+        eval_interval,
+        n_eval_episodes,
+        board,
+        lock,
+        min_reports,
+        stop_quantile,
+    )
+    model.learn(total_timesteps=timesteps, callback=callback)
+    result.timesteps = model.num_timesteps
+    result.stopped_early = model.num_timesteps < timesteps
+
+    # Score the final model when the trial did not end on a checkpoint
+    if not result.stopped_early and model.num_timesteps % eval_interval:
+        score = _mean_fruits_eaten(model, eval_env, n_eval_episodes)
+        _record_score(result, score)
+
+    env.close()
+    eval_env.close()
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+class _CheckpointCallback(BaseCallback):
+    """Evaluates a trial every eval_interval steps and stops it if losing.
+
+    Each score is reported to a board shared by all trials. Once at least
+    min_reports other trials have reached the same checkpoint, a trial
+    scoring below their stop_quantile stops learning.
+    """
+
+    def __init__(
+        self,
+        result: TrialResult,
+        eval_env: SnakeGameEnv,
+        eval_interval: int,
+        n_eval_episodes: int,
+        board: dict[int, list[float]],
+        lock: Any,
+        min_reports: int,
+        stop_quantile: float,
+    ) -> None:
+        super().__init__()
+        self.result = result
+        self.eval_env = eval_env
+        self.eval_interval = eval_interval
+        self.n_eval_episodes = n_eval_episodes
+        self.board = board
+        self.lock = lock
+        self.min_reports = min_reports
+        self.stop_quantile = stop_quantile
+
+    def _on_step(self) -> bool:
+        if self.num_timesteps % self.eval_interval:
+            return True
+
+        score = _mean_fruits_eaten(
+            self.model, self.eval_env, self.n_eval_episodes
+        )
+        _record_score(self.result, score)
+
+        # Report to the shared board and compare against the other trials
+        checkpoint = self.num_timesteps // self.eval_interval
+        with self.lock:
+            peers = self.board.get(checkpoint, [])
+            self.board[checkpoint] = peers + [score]
+
+        return not (
+            len(peers) >= self.min_reports
+            and score < _quantile(peers, self.stop_quantile)
+        )
+
+
+def _record_score(result: TrialResult, score: float) -> None:
+    """Adds an evaluation score to the trial result."""
+    result.score = score
+    result.scores.append(score)
+    result.best_score = max(result.best_score, score)
+
+
+def _mean_fruits_eaten(model: DQN, env: SnakeGameEnv, n_episodes: int) -> float:
+    """Returns the mean fruits eaten per episode by the greedy policy.
+
+    Episode i always starts from seed i, and the env uses the default
+    rewards and starvation limit. Together with counting fruits instead of
+    rewards, this makes scores comparable across checkpoints and trials.
+    """
+    total = 0
+    for seed in range(n_episodes):
+        obs, _ = env.reset(seed=seed)
+        terminated = truncated = False
+        while not (terminated or truncated):
+            action, _ = model.predict(obs, deterministic=True)
+            obs, _, terminated, truncated, _ = env.step(int(action))
+        total += env.model.state.fruits_eaten
+    return total / n_episodes
+
+
+def _quantile(values: list[float], q: float) -> float:
+    """Returns the q-th quantile of the values."""
+    if len(values) == 1:
+        return values[0]
+    cut_points = statistics.quantiles(values, n=100, method="inclusive")
+    return cut_points[min(98, max(0, round(q * 100) - 1))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--search",
+        choices=["grid", "random"],
+        default="random",
+        help="How to sample configurations from the search space",
+    )
+    parser.add_argument(
+        "--trials",
+        type=int,
+        default=32,
+        help="Number of configurations for random search",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--timesteps", type=int, default=50000)
+    parser.add_argument("--eval-interval", type=int, default=5000)
+    parser.add_argument("--eval-episodes", type=int, default=5)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (defaults to cores / threads)",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=1, help="Torch threads per worker"
+    )
+    parser.add_argument(
+        "--min-reports",
+        type=int,
+        default=3,
+        help="Peers needed at a checkpoint before a trial can be stopped",
+    )
+    parser.add_argument(
+        "--stop-quantile",
+        type=float,
+        default=0.25,
+        help="Stop trials scoring below this quantile of their peers",
+    )
+    parser.add_argument("--output", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    if args.search == "grid":
+        trials = grid_search(SEARCH_SPACE)
+    else:
+        trials = random_search(SEARCH_SPACE, args.trials, args.seed)
+
+    results = run_sweep(
+        trials,
+        timesteps=args.timesteps,
+        eval_interval=args.eval_interval,
+        n_eval_episodes=args.eval_episodes,
+        n_workers=args.workers,
+        threads_per_worker=args.threads,
+        min_reports=args.min_reports,
+        stop_quantile=args.stop_quantile,
+    )
+    print_results(results)
+    save_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,68 @@
 """Trains the noodle."""
 
+import argparse
+import dataclasses
+import json
+import os
+from dataclasses import dataclass
+
 import matplotlib.pyplot as plt
 import numpy as np
+import torch
 from stable_baselines3 import DQN
+from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.evaluation import evaluate_policy
+from stable_baselines3.common.vec_env import SubprocVecEnv, VecEnv
+
+from src.neural import RewardConfig, SnakeGameEnv
+
+# Where autotune writes its recommendation for this machine
+DEFAULT_CONFIG_PATH = "model/train_config.json"
+
 
-from src.neural import SnakeGameEnv
+@dataclass
+class TrainingConfig:
+    """Throughput settings for DQN training, as recommended by autotune."""
+
+    n_envs: int = 1
+    torch_threads: int | None = None
+    batch_size: int = 64
+    train_freq: int = 4
+    gradient_steps: int = 1
+
+    @property
+    def replay_ratio(self) -> float:
+        """Transitions replayed in updates per transition collected."""
+        return (
+            self.batch_size
+            * self.gradient_steps
+            / (self.train_freq * self.n_envs)
+        )
+
+
+def load_training_config(path: str = DEFAULT_CONFIG_PATH) -> TrainingConfig:
+    """Loads the training config, falling back to defaults if missing."""
+    if not os.path.exists(path):
+        return TrainingConfig()
+
+    with open(path) as file:
+        values = json.load(file)
+    names = {f.name for f in dataclasses.fields(TrainingConfig)}
+    return TrainingConfig(
+        **{key: value for key, value in values.items() if key in names}
+    )
+
+
+def save_training_config(
+    config: TrainingConfig,
+    path: str = DEFAULT_CONFIG_PATH,
+    extra: dict | None = None,
+) -> None:
+    """Saves the training config, along with any extra information."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        values = {**dataclasses.asdict(config), **(extra or {})}
+        json.dump(values, file, indent=2)
 
 
 def setup_plot() -> (
@@ -62,20 +119,65 @@ def update_plot(
 
 
 def create_snake_env(
-    width: int = 400, height: int = 400, cell_size: int = 25, fps: int = 120
+    width: int = 400,
+    height: int = 400,
+    cell_size: int = 25,
+    fps: int = 120,
+    rewards: RewardConfig | None = None,
+    verbose: bool = True,
 ) -> SnakeGameEnv:
     """Creates and returns the Snake game environment."""
     return SnakeGameEnv(
-        width=width, height=height, cell_size=cell_size, fps=fps
+        width=width,
+        height=height,
+        cell_size=cell_size,
+        fps=fps,
+        rewards=rewards,
+        verbose=verbose,
     )
 
 
+def create_training_env(n_envs: int = 1, **env_kwargs) -> VecEnv:
+    """Creates n_envs quiet copies of the environment for learning.
+
+    Several copies run in their own processes without opening a window.
+    """
+    env_kwargs.setdefault("verbose", False)
+    if n_envs == 1:
+        return make_vec_env(create_snake_env, env_kwargs=env_kwargs)
+    return make_vec_env(
+        _create_headless_snake_env,
+        n_envs=n_envs,
+        env_kwargs=env_kwargs,
+        vec_env_cls=SubprocVecEnv,
+    )
+
+
+def _create_headless_snake_env(**env_kwargs) -> SnakeGameEnv:
+    """Creates the environment with pygame's dummy video driver."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    return create_snake_env(**env_kwargs)
+
+
 def create_dqn_model(
-    env: SnakeGameEnv, buffer_size: int = 500000, learning_rate: float = 1e-3
+    env: SnakeGameEnv | VecEnv,
+    buffer_size: int = 500000,
+    learning_rate: float = 1e-3,
+    batch_size: int = 64,
+    train_freq: int = 4,
+    gradient_steps: int = 1,
+    learning_starts: int = 100,
+    gamma: float = 0.99,
+    exploration_fraction: float = 0.4,
+    exploration_final_eps: float = 0.01,
+    target_update_interval: int = 1000,
+    net_arch: list[int] | None = None,
+    seed: int | None = None,
 ) -> DQN:
     """Creates and returns the DQN model for training."""
     policy_kwargs = dict(
-        net_arch=[256, 256]  # Two hidden layers, each with 256 units
+        # Two hidden layers, each with 256 units, unless overridden
+        net_arch=net_arch or [256, 256]
     )
 
     return DQN(
@@ -84,24 +186,49 @@ def create_dqn_model(
         verbose=0,
         buffer_size=buffer_size,
         learning_rate=learning_rate,
-        batch_size=64,
-        exploration_fraction=0.4,
+        batch_size=batch_size,
+        train_freq=train_freq,
+        gradient_steps=gradient_steps,
+        learning_starts=learning_starts,
+        gamma=gamma,
+        exploration_fraction=exploration_fraction,
         exploration_initial_eps=1.0,
-        exploration_final_eps=0.01,
-        target_update_interval=1000,
+        exploration_final_eps=exploration_final_eps,
+        target_update_interval=target_update_interval,
         policy_kwargs=policy_kwargs,
+        seed=seed,
     )
 
 
-def train_snake_dqn(timesteps: int = 10000) -> None:
-    """Trains a DQN model on the Snake game and evaluates its performance."""
+def train_snake_dqn(
+    timesteps: int = 10000,
+    config_path: str = DEFAULT_CONFIG_PATH,
+    use_learn: bool = False,
+) -> None:
+    """Trains a DQN model on the Snake game and evaluates its performance.
+
+    By default training steps a single window with live plots. With
+    use_learn, Stable Baselines3 trains headless on the configured number
+    of envs, batch size, train frequency and gradient steps.
+    """
+    # Apply the throughput settings recommended for this machine
+    config = load_training_config(config_path)
+    if config.torch_threads:
+        torch.set_num_threads(config.torch_threads)
 
     # Create environment and DQN model
-    env = create_snake_env()
-    model = create_dqn_model(env)
+    if use_learn:
+        env = create_training_env(config.n_envs)
+    else:
+        env = create_snake_env()
+    model = create_dqn_model(
+        env,
+        batch_size=config.batch_size,
+        train_freq=config.train_freq,
+        gradient_steps=config.gradient_steps,
+    )
 
-    USE_LEARN = False
-    if USE_LEARN:
+    if use_learn:
         model.learn(total_timesteps=timesteps)
     else:
         # Initialize tracking variables
@@ -173,5 +300,21 @@ def evaluate_and_print_results(
     print(f"Mean reward: {mean_reward}, Std reward: {std_reward}")
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--timesteps", type=int, default=50000)
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument(
+        "--learn",
+        action="store_true",
+        help="Train headless with model.learn and the autotuned config",
+    )
+    args = parser.parse_args()
+
+    train_snake_dqn(
+        timesteps=args.timesteps, config_path=args.config, use_learn=args.learn
+    )
+
+
 if __name__ == "__main__":
-    train_snake_dqn(timesteps=50000)
+    main()
@@ -0,0 +1,236 @@
+"""Many Snake Game boards advanced together with array operations."""
+
+import numpy as np
+
+from src.neural.environment import RewardConfig
+from src.noodle.model import Direction
+
+# Cell offsets (x, y) for UP, RIGHT, DOWN, LEFT
+_DELTAS = np.array([[0, -1], [1, 0], [0, 1], [-1, 0]], dtype=np.int64)
+
+
+class BatchedSnakeEnv:
+    """Vectorized Snake Game with the same rules as SnakeGameEnv.
+
+    Positions are kept in cells rather than pixels. Each board stores, per
+    cell, how many more moves the snake body will occupy it, so moving the
+    whole snake is a single decrement and collisions are a single lookup.
+
+    Boards that finish stay frozen and report zero reward until they are
+    reset.
+
+    Fruit placement is drawn from a per-board stream: the n-th fruit of a
+    board is a hash of its stream seed, n and each free cell. With
+    fruit_streams set, board b uses stream b % fruit_streams, so boards
+    sharing a stream get the same fruit whenever their snakes match.
+    """
+
+    def __init__(
+        self,
+        n_boards: int,
+        width: int = 400,
+        height: int = 400,
+        cell_size: int = 25,
+        rewards: RewardConfig | None = None,
+        seed: int | None = None,
+        fruit_streams: int | None = None,
+    ) -> None:
+        self.n_boards = n_boards
+        self.fruit_streams = fruit_streams or n_boards
+        self.cols = width // cell_size
+        self.rows = height // cell_size
+        self.rewards = rewards or RewardConfig()
+        self.start = np.array(
+            [(width // 2) // cell_size, (height // 2) // cell_size]
+        )
+        self.start_length = 3
+
+        self._boards = np.arange(n_boards)
+        self._cells = np.arange(self.rows * self.cols, dtype=np.uint64)
+        self._stream_seeds = self._draw_stream_seeds(seed)
+        self._spawns = np.zeros(n_boards, dtype=np.uint64)
+
+        self.body = np.zeros((n_boards, self.rows, self.cols), dtype=np.int32)
+        self.head = np.zeros((n_boards, 2), dtype=np.int64)
+        self.fruit = np.zeros((n_boards, 2), dtype=np.int64)
+        self.direction = np.zeros(n_boards, dtype=np.int64)
+        self.length = np.zeros(n_boards, dtype=np.int32)
+        self.turns_since_ate = np.zeros(n_boards, dtype=np.int32)
+        self.fruits_eaten = np.zeros(n_boards, dtype=np.int32)
+        self.distance_to_fruit = np.zeros(n_boards, dtype=np.int64)
+        self.terminated = np.zeros(n_boards, dtype=bool)
+        self.truncated = np.zeros(n_boards, dtype=bool)
+
+        self.reset()
+
+    @property
+    def done(self) -> np.ndarray:
+        """Returns which boards have finished their episode."""
+        return self.terminated | self.truncated
+
+    def reset(
+        self, seed: int | None = None, mask: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Resets the boards selected by mask (all by default)."""
+        if seed is not None:
+            self._stream_seeds = self._draw_stream_seeds(seed)
+        if mask is None:
+            mask = np.ones(self.n_boards, dtype=bool)
+        boards = np.flatnonzero(mask)
+
+        self.body[boards] = 0
+        self.head[boards] = self.start
+        self.body[boards, self.start[1], self.start[0]] = self.start_length
+        self.direction[boards] = Direction.RIGHT.value
+        self.length[boards] = self.start_length
+        self.turns_since_ate[boards] = 0
+        self.fruits_eaten[boards] = 0
+        self._spawns[boards] = 0
+        self.terminated[boards] = False
+        self.truncated[boards] = False
+
+        self._spawn_fruit(boards)
+        self.distance_to_fruit[boards] = np.abs(
+            self.head[boards] - self.fruit[boards]
+        ).sum(axis=1)
+
+        return self._get_observation()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Applies one action per board and advances every active board."""
+        active = ~self.done
+        boards = np.flatnonzero(active)
+        actions = np.asarray(actions, dtype=np.int64)[boards]
+
+        # Reversing onto the body is ignored, as in Snake.set_direction
+        turn = (actions - self.direction[boards]) % 4 != 2
+        self.direction[boards] = np.where(
+            turn, actions, self.direction[boards]
+        )
+        self.head[boards] += _DELTAS[self.direction[boards]]
+
+        # The tail moves out before the head moves in
+        np.subtract(
+            self.body,
+            1,
+            out=self.body,
+            where=(self.body > 0) & active[:, None, None],
+        )
+
+        x, y = self.head[boards].T
+        inside = (x >= 0) & (x < self.cols) & (y >= 0) & (y < self.rows)
+        collided = ~inside
+        collided[inside] = (
+            self.body[boards[inside], y[inside], x[inside]] > 0
+        )
+
+        alive = boards[~collided]
+        self.body[alive, y[~collided], x[~collided]] = self.length[alive]
+
+        ate = np.all(self.head[alive] == self.fruit[alive], axis=1)
+        # Everything except the distance follows Model._update_game_state,
+        # which measures the distance before a new fruit is spawned
+        self.distance_to_fruit[alive] = np.abs(
+            self.head[alive] - self.fruit[alive]
+        ).sum(axis=1)
+        eaters = alive[ate]
+        starving = alive[~ate]
+
+        # Growing is the same as every body cell staying one move longer
+        grow = np.zeros(self.n_boards, dtype=bool)
+        grow[eaters] = True
+        np.add(
+            self.body,
+            1,
+            out=self.body,
+            where=(self.body > 0) & grow[:, None, None],
+        )
+        self.length[eaters] += 1
+        self.fruits_eaten[eaters] += 1
+        self.turns_since_ate[eaters] = 0
+        self.turns_since_ate[starving] += 1
+        self._spawn_fruit(eaters)
+
+        starved = starving[
+            self.turns_since_ate[starving] >= self.rewards.starvation_limit
+        ]
+
+        rewards = np.zeros(self.n_boards, dtype=np.float32)
+        rewards[starving] = self.rewards.survive
+        rewards[eaters] = self.rewards.fruit
+        rewards[starved] = self.rewards.starvation
+        rewards[boards[collided]] = self.rewards.death
+
+        self.terminated[boards[collided]] = True
+        self.terminated[starved] = True
+        self.truncated[starved] = True
+
+        info = {"fruits_eaten": self.fruits_eaten}
+        return (
+            self._get_observation(),
+            rewards,
+            self.terminated.copy(),
+            self.truncated.copy(),
+            info,
+        )
+
+    def _spawn_fruit(self, boards: np.ndarray) -> None:
+        """Places a fruit on a random free cell of each given board."""
+        if len(boards) == 0:
+            return
+        free = (self.body[boards] == 0).reshape(len(boards), -1)
+        seeds = self._stream_seeds[boards % self.fruit_streams]
+        keys = self._spawns[boards, None] * np.uint64(len(self._cells))
+        scores = _splitmix64(seeds[:, None] ^ _splitmix64(keys + self._cells))
+        cells = np.where(free, scores, 0).argmax(axis=1)
+        self._spawns[boards] += np.uint64(1)
+        self.fruit[boards, 0] = cells % self.cols
+        self.fruit[boards, 1] = cells // self.cols
+
+    def _draw_stream_seeds(self, seed: int | None) -> np.ndarray:
+        """Returns a random seed for every fruit stream."""
+        rng = np.random.default_rng(seed)
+        return rng.integers(
+            0, 2**64, size=self.fruit_streams, dtype=np.uint64
+        )
+
+    def _get_observation(self) -> np.ndarray:
+        """Direction, distance to danger, and distance to fruit per board."""
+        # Finished boards may have their head off the grid
+        x = np.clip(self.head[:, 0], 0, self.cols - 1)
+        y = np.clip(self.head[:, 1], 0, self.rows - 1)
+
+        row = self.body[self._boards, y, :] > 0
+        column = self.body[self._boards, :, x] > 0
+        col_index = np.arange(self.cols)[None, :]
+        row_index = np.arange(self.rows)[None, :]
+        x, y = x[:, None], y[:, None]
+
+        # Distance to the wall, unless a body segment is closer
+        distance_up = np.where(column & (row_index < y), y - row_index, y)
+        distance_right = np.where(
+            row & (col_index > x), col_index - x, self.cols - 1 - x
+        )
+        distance_down = np.where(
+            column & (row_index > y), row_index - y, self.rows - 1 - y
+        )
+        distance_left = np.where(row & (col_index < x), x - col_index, x)
+
+        observation = np.empty((self.n_boards, 6), dtype=np.float32)
+        observation[:, 0] = self.direction
+        observation[:, 1] = distance_up.min(axis=1)
+        observation[:, 2] = distance_right.min(axis=1)
+        observation[:, 3] = distance_down.min(axis=1)
+        observation[:, 4] = distance_left.min(axis=1)
+        observation[:, 5] = self.distance_to_fruit
+        return observation
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Mixes 64 bit integers into well spread pseudo-random values."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
@@ -0,0 +1,241 @@
+"""Frame stacking and normalization for Snake Game observations."""
+
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+
+
+class RunningMeanStd:
+    """Running mean and variance of observations, updated in place."""
+
+    def __init__(self, obs_dim: int, max_batch: int = 1) -> None:
+        self.mean = np.zeros(obs_dim, dtype=np.float64)
+        self.var = np.ones(obs_dim, dtype=np.float64)
+        self.count = 1e-4
+
+        # Scratch space so updates never allocate
+        self._batch_mean = np.zeros(obs_dim, dtype=np.float64)
+        self._batch_var = np.zeros(obs_dim, dtype=np.float64)
+        self._delta = np.zeros(obs_dim, dtype=np.float64)
+        self._step = np.zeros(obs_dim, dtype=np.float64)
+        self._std = np.ones(obs_dim, dtype=np.float64)
+        self._centered = np.zeros((max_batch, obs_dim), dtype=np.float64)
+
+    def update(self, batch: np.ndarray) -> None:
+        """Folds a (batch, obs_dim) array of observations into the stats."""
+        n = len(batch)
+        centered = self._centered[:n]
+
+        np.mean(batch, axis=0, out=self._batch_mean)
+        np.subtract(batch, self._batch_mean, out=centered)
+        np.square(centered, out=centered)
+        np.mean(centered, axis=0, out=self._batch_var)
+
+        # Chan et al. parallel update of the mean and variance
+        total = self.count + n
+        np.subtract(self._batch_mean, self.mean, out=self._delta)
+        np.multiply(self._delta, n / total, out=self._step)
+        self.mean += self._step
+
+        self.var *= self.count / total
+        self._batch_var *= n / total
+        self.var += self._batch_var
+        np.square(self._delta, out=self._delta)
+        self._delta *= self.count * n / total**2
+        self.var += self._delta
+
+        self.count = total
+
+    def normalize(
+        self, batch: np.ndarray, out: np.ndarray, clip: float, eps: float
+    ) -> None:
+        """Writes the normalized and clipped batch into out."""
+        np.add(self.var, eps, out=self._std)
+        np.sqrt(self._std, out=self._std)
+        np.subtract(batch, self.mean, out=out)
+        np.divide(out, self._std, out=out)
+        np.clip(out, -clip, clip, out=out)
+
+
+class ObservationStack:
+    """Ring buffer of the last frames of one or more environments.
+
+    Every frame is written twice, K slots apart, into a single (envs, 2K,
+    obs_dim) array. The K newest frames are therefore always a contiguous
+    slice, and the stacked observation is returned as a view of the buffer
+    without copying. The returned view is overwritten by the next push.
+    """
+
+    def __init__(
+        self,
+        n_envs: int,
+        n_frames: int,
+        obs_dim: int,
+        normalize: bool = True,
+        clip: float = 10.0,
+        eps: float = 1e-8,
+    ) -> None:
+        self.n_envs = n_envs
+        self.n_frames = n_frames
+        self.obs_dim = obs_dim
+        self.normalize = normalize
+        self.clip = clip
+        self.eps = eps
+        # Set to False to freeze the statistics, e.g. during evaluation
+        self.update_stats = True
+
+        self.stats = RunningMeanStd(obs_dim, max_batch=n_envs)
+        self._buffer = np.zeros(
+            (n_envs, 2 * n_frames, obs_dim), dtype=np.float32
+        )
+        self._frame = np.zeros((n_envs, obs_dim), dtype=np.float32)
+        self._index = 0
+
+        # One ordered view per write position, built once up front
+        self._views = [
+            self._buffer[:, i + 1 : i + 1 + n_frames].reshape(
+                n_envs, n_frames * obs_dim
+            )
+            for i in range(n_frames)
+        ]
+
+    def reset(
+        self,
+        obs: np.ndarray,
+        mask: np.ndarray | None = None,
+        update: bool = True,
+    ) -> np.ndarray:
+        """Fills the history of the masked environments with obs.
+
+        The observations of the reset environments are folded into the
+        stats. Pass update=False when they were already pushed, as after an
+        autoreset.
+        """
+        if update:
+            self._update_stats(obs if mask is None else obs[mask])
+        frame = self._process(obs, update=False)
+        if mask is None:
+            self._buffer[:] = frame[:, None, :]
+        else:
+            self._buffer[mask] = frame[mask][:, None, :]
+        return self._views[(self._index - 1) % self.n_frames]
+
+    def push(self, obs: np.ndarray) -> np.ndarray:
+        """Appends a frame per environment and returns the stacked view."""
+        frame = self._process(obs)
+        i = self._index
+        self._buffer[:, i] = frame
+        self._buffer[:, i + self.n_frames] = frame
+        self._index = (i + 1) % self.n_frames
+        return self._views[i]
+
+    def _process(self, obs: np.ndarray, update: bool = True) -> np.ndarray:
+        """Updates the stats and returns the frame to store."""
+        if not self.normalize:
+            np.copyto(self._frame, obs)
+            return self._frame
+        if update:
+            self._update_stats(obs)
+        self.stats.normalize(obs, self._frame, self.clip, self.eps)
+        return self._frame
+
+    def _update_stats(self, obs: np.ndarray) -> None:
+        """Folds obs into the stats unless they are frozen or unused."""
+        if self.normalize and self.update_stats and len(obs):
+            self.stats.update(obs)
+
+
+class FrameStackNormalize(gym.Wrapper):
+    """Stacks and normalizes the observations of a single environment."""
+
+    def __init__(
+        self,
+        env: gym.Env,
+        n_frames: int = 4,
+        normalize: bool = True,
+        clip: float = 10.0,
+    ) -> None:
+        super().__init__(env)
+        (obs_dim,) = env.observation_space.shape
+        self.stack = ObservationStack(
+            1, n_frames, obs_dim, normalize=normalize, clip=clip
+        )
+
+        if normalize:
+            self.observation_space = spaces.Box(
+                low=-clip,
+                high=clip,
+                shape=(n_frames * obs_dim,),
+                dtype=np.float32,
+            )
+        else:
+            self.observation_space = spaces.Box(
+                low=np.tile(env.observation_space.low, n_frames),
+                high=np.tile(env.observation_space.high, n_frames),
+                dtype=np.float32,
+            )
+
+    def reset(self, **kwargs: Any) -> tuple[np.ndarray, dict]:
+        """Resets the environment and fills the history with the first obs."""
+        obs, info = self.env.reset(**kwargs)
+        return self.stack.reset(obs[None])[0], info
+
+    def step(self, action: Any) -> tuple[np.ndarray, Any, bool, bool, dict]:
+        """Steps the environment and returns the stacked observation."""
+        obs, reward, terminated, truncated, info = self.env.step(action)
+        stacked = self.stack.push(obs[None])[0]
+        return stacked, reward, terminated, truncated, info
+
+
+class BatchedFrameStackNormalize:
+    """Stacks and normalizes the observations of a batched environment.
+
+    Works with environments such as BatchedSnakeEnv whose reset and step
+    return observations of shape (envs, obs_dim). Set autoreset for
+    environments that reset finished boards on their own, so their history
+    is restarted from the first observation of the new episode.
+    """
+
+    def __init__(
+        self,
+        env: Any,
+        n_envs: int,
+        obs_dim: int = 6,
+        n_frames: int = 4,
+        normalize: bool = True,
+        clip: float = 10.0,
+        autoreset: bool = False,
+    ) -> None:
+        self.env = env
+        self.autoreset = autoreset
+        self.stack = ObservationStack(
+            n_envs, n_frames, obs_dim, normalize=normalize, clip=clip
+        )
+
+    def reset(
+        self, *args: Any, mask: np.ndarray | None = None, **kwargs: Any
+    ) -> Any:
+        """Resets the environment and the history of the reset boards."""
+        if mask is not None:
+            kwargs["mask"] = mask
+        result = self.env.reset(*args, **kwargs)
+        # Gymnasium envs return (obs, info), BatchedSnakeEnv returns obs
+        if isinstance(result, tuple):
+            obs, info = result
+            return self.stack.reset(obs, mask), info
+        return self.stack.reset(result, mask)
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """Steps every board and returns the stacked observations."""
+        obs, rewards, terminated, truncated, info = self.env.step(actions)
+        stacked = self.stack.push(obs)
+        if self.autoreset:
+            done = terminated | truncated
+            if done.any():
+                # The new first observations were just pushed
+                stacked = self.stack.reset(obs, done, update=False)
+        return stacked, rewards, terminated, truncated, info
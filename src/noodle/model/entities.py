@@ -87,6 +87,10 @@ class Snake:
         """Returns the segments of the snake."""
         return list(self._segments)
 
+    def length(self) -> int:
+        """Returns the number of segments the snake is growing to."""
+        return self._length
+
     def size(self) -> int:
         """Returns the size of the snake."""
         return self._size
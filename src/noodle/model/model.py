@@ -28,14 +28,26 @@ class Model:
         self.width = width
         self.height = height
         self.cell_size = cell_size
+        self._random = random.Random()
 
         self.reset()
 
-    def reset(self):
-        """Resets the game state and metrics."""
+    def reset(self, seed: int | None = None):
+        """Resets the game state and metrics.
+
+        Passing a seed makes the fruit placement of the following game
+        reproducible.
+        """
+        if seed is not None:
+            self._random.seed(seed)
         self.spawn_snake()
         self.spawn_fruit()
-        self.state = GameState()
+        self.state = GameState(
+            distance_to_fruit=_manhattan_distance(
+                self.snake.head(), self.fruit.position()
+            )
+            // self.cell_size
+        )
 
     def play_step(self, direction: Direction) -> GameState:
         """Updates the game state based on the player's action."""
@@ -72,9 +84,9 @@ class Model:
         """Spawns a fruit at a random location not occupied by the snake."""
         while True:
             fruit_position = Point(
-                random.randint(0, self.width // self.cell_size - 1)
+                self._random.randint(0, self.width // self.cell_size - 1)
                 * self.cell_size,
-                random.randint(0, self.height // self.cell_size - 1)
+                self._random.randint(0, self.height // self.cell_size - 1)
                 * self.cell_size,
             )
             if fruit_position not in self.snake.segments():
@@ -1,3 +1,4 @@
 """Snake Game View Package."""
 
 from .view import View
+from .raster import Rasterizer
@@ -0,0 +1,72 @@
+"""Snake Game offscreen rasterizer."""
+
+import numpy as np
+
+from src.noodle.model import Fruit, Snake
+
+from .view import Colors
+
+# Cell labels used in the grids passed to Rasterizer.render
+EMPTY = 0
+SNAKE = 1
+FRUIT = 2
+
+
+class Rasterizer:
+    """Draws Snake game frames into NumPy arrays without a display.
+
+    Frames match what View draws: a black board with a white cell grid,
+    a blue snake and a red fruit. The snake and fruit are first written
+    into a small grid of cell labels, and whole batches of grids are then
+    scaled up to RGB frames in one pass.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cols = width // cell_size
+        self.rows = height // cell_size
+
+        self._palette = np.array(
+            [Colors.BLACK.value, Colors.BLUE.value, Colors.RED.value],
+            dtype=np.uint8,
+        )
+
+        # Pixels on the one pixel outline of each cell, as drawn by View
+        x = np.arange(self.cols * cell_size) % cell_size
+        y = np.arange(self.rows * cell_size) % cell_size
+        x_edge = (x == 0) | (x == cell_size - 1)
+        y_edge = (y == 0) | (y == cell_size - 1)
+        self._grid_lines = y_edge[:, None] | x_edge[None, :]
+
+    def cells(self, snake: Snake, fruit: Fruit) -> np.ndarray:
+        """Returns the (rows, cols) grid of cell labels for a game state."""
+        cells = np.zeros((self.rows, self.cols), dtype=np.uint8)
+
+        fruit_x, fruit_y = fruit.position()
+        cells[fruit_y // self.cell_size, fruit_x // self.cell_size] = FRUIT
+
+        for segment in snake.segments():
+            col = segment.x // self.cell_size
+            row = segment.y // self.cell_size
+            # The head leaves the board on the step the snake hits a wall
+            if 0 <= col < self.cols and 0 <= row < self.rows:
+                cells[row, col] = SNAKE
+
+        return cells
+
+    def render(self, cells: np.ndarray) -> np.ndarray:
+        """Converts a (batch, rows, cols) label grid to RGB frames.
+
+        Returns a uint8 array of shape (batch, rows * cell_size,
+        cols * cell_size, 3).
+        """
+        pixels = cells.repeat(self.cell_size, axis=1).repeat(
+            self.cell_size, axis=2
+        )
+        frames = self._palette[pixels]
+
+        # Filled cells cover the grid lines, just like the pygame view
+        frames[(pixels == EMPTY) & self._grid_lines] = Colors.WHITE.value
+        return frames
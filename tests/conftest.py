@@ -0,0 +1,6 @@
+"""Shared pytest setup for the Snake Game tests."""
+
+import os
+
+# The environments create a pygame View, which needs no real display here
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
@@ -0,0 +1,19 @@
+"""Checks the training configs that autotune compares."""
+
+from src.neural.autotune import candidate_configs
+from src.neural.train import TrainingConfig
+
+
+def test_candidates_share_the_replay_ratio() -> None:
+    ratio = TrainingConfig().replay_ratio
+    configs = candidate_configs(
+        n_envs=[1],
+        torch_threads=[1],
+        batch_sizes=[64, 128, 256],
+        train_freqs=[1, 2, 4, 8, 16],
+    )
+
+    assert TrainingConfig(torch_threads=1) in configs
+    assert {config.batch_size for config in configs} == {64, 128, 256}
+    for config in configs:
+        assert config.replay_ratio == ratio
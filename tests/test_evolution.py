@@ -0,0 +1,56 @@
+"""Checks the evolution strategy's ranking and saved policies."""
+
+import numpy as np
+import torch
+
+from src.neural import SnakeGameEnv
+from src.neural.evolution import (
+    N_INPUTS,
+    batched_forward,
+    centered_ranks,
+    load_evolution_policy,
+    train_snake_evolution,
+    unflatten_population,
+)
+from src.neural.export import record_episode
+
+
+def test_centered_ranks_spread_evenly() -> None:
+    ranks = centered_ranks(np.array([3.0, -1.0, 10.0, 0.0, 7.0]))
+    np.testing.assert_allclose(ranks, [0.0, -0.5, 0.5, -0.25, 0.25])
+
+
+def test_tied_fitness_shares_its_rank() -> None:
+    fitness = np.array([-3.0, 5.0, -3.0, -3.0, 1.0, -3.0])
+    ranks = centered_ranks(fitness)
+
+    assert len(set(ranks[fitness == -3.0])) == 1
+    assert ranks.sum() == 0.0
+    # Mirrored pairs with equal fitness give no update
+    half = len(fitness) // 2
+    assert (ranks[:half] - ranks[half:])[0] == 0.0
+    np.testing.assert_array_equal(centered_ranks(np.full(4, -3.0)), 0.0)
+
+
+def test_saved_weights_load_as_a_policy(tmp_path) -> None:
+    path = str(tmp_path / "es_snake.pth")
+    params = train_snake_evolution(
+        generations=1,
+        population_size=4,
+        episodes=1,
+        max_steps=20,
+        net_arch=[8],
+        n_workers=1,
+        save_path=path,
+    )
+    policy = load_evolution_policy(path)
+
+    layers = unflatten_population(torch.from_numpy(params[None]), [8])
+    obs = np.random.default_rng(0).normal(size=(10, N_INPUTS))
+    expected = batched_forward(
+        layers, torch.from_numpy(obs[None].astype(np.float32))
+    ).argmax(dim=2)[0]
+    assert [policy(o) for o in obs] == expected.tolist()
+
+    episode = record_episode(SnakeGameEnv(verbose=False), policy, seed=0)
+    assert episode.actions
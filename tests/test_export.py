@@ -0,0 +1,82 @@
+"""Checks offscreen rendering and episode replay against the live game."""
+
+import random
+from collections.abc import Callable
+
+import numpy as np
+import pygame
+import pytest
+
+from src.neural import SnakeGameEnv
+from src.neural.export import Episode, record_episode, replay_cells
+from src.noodle.view import Rasterizer
+
+
+def _rasterizer(env: SnakeGameEnv) -> Rasterizer:
+    """Returns a rasterizer for the env's board."""
+    return Rasterizer(env.width, env.height, env.cell_size)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_frames_match_the_pygame_view(seed: int) -> None:
+    env = SnakeGameEnv(verbose=False)
+    rasterizer = _rasterizer(env)
+    rng = random.Random(seed)
+    env.reset(seed=seed)
+
+    for _ in range(30):
+        model = env.model
+        env.view.render(model.snake, model.fruit, model.state.fruits_eaten)
+        # surfarray indexes pixels by (x, y)
+        expected = pygame.surfarray.array3d(env.view.surface)
+        cells = rasterizer.cells(model.snake, model.fruit)
+        np.testing.assert_array_equal(
+            rasterizer.render(cells[None])[0], expected.transpose(1, 0, 2)
+        )
+
+        _, _, terminated, truncated, _ = env.step(rng.randrange(4))
+        if terminated or truncated:
+            env.reset(seed=rng.randrange(1000))
+
+
+def _record_with_cells(
+    env: SnakeGameEnv, policy: Callable[[np.ndarray], int], seed: int
+) -> tuple[Episode, np.ndarray]:
+    """Records an episode along with the live cells of every state."""
+    rasterizer = _rasterizer(env)
+    live = []
+
+    def recording_policy(obs: np.ndarray) -> int:
+        live.append(rasterizer.cells(env.model.snake, env.model.fruit))
+        return policy(obs)
+
+    episode = record_episode(env, recording_policy, seed, max_steps=200)
+    live.append(rasterizer.cells(env.model.snake, env.model.fruit))
+    return episode, np.stack(live)
+
+
+def _replay(episode: Episode, batch_size: int) -> np.ndarray:
+    """Replays an episode and joins its batches of cells."""
+    batches = [b.copy() for b in replay_cells(episode, batch_size=batch_size)]
+    assert all(0 < len(batch) <= batch_size for batch in batches)
+    return np.concatenate(batches)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_matches_the_live_episode(seed: int) -> None:
+    env = SnakeGameEnv(verbose=False, safety_shield=True)
+    rng = random.Random(seed)
+    episode, live = _record_with_cells(env, lambda _: rng.randrange(4), seed)
+
+    np.testing.assert_array_equal(_replay(episode, batch_size=3), live)
+
+
+@pytest.mark.parametrize("batch_size", [1, 4, 10, 64])
+def test_replay_stops_when_the_snake_dies(batch_size: int) -> None:
+    # Heading up from the middle of the board runs into the wall
+    env = SnakeGameEnv(verbose=False)
+    episode, live = _record_with_cells(env, lambda _: 0, seed=0)
+    assert env.model.state.done
+
+    padded = Episode(episode.seed, episode.actions + [1, 2, 3])
+    np.testing.assert_array_equal(_replay(padded, batch_size), live)
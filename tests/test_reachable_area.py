@@ -0,0 +1,131 @@
+"""Checks the free-region tracking behind the reachable areas and shield."""
+
+import random
+from collections import deque
+
+import pytest
+
+from src.neural import SnakeGameEnv
+from src.neural.flood_fill import ReachableArea
+from src.noodle.model import Direction, Point
+
+
+def _region_sizes(free: set[int], cols: int, rows: int) -> dict[int, int]:
+    """Returns the size of the region of every free cell by flood fill."""
+    sizes: dict[int, int] = {}
+    for start in free:
+        if start in sizes:
+            continue
+        region, queue = {start}, deque([start])
+        while queue:
+            cell = queue.popleft()
+            x, y = cell % cols, cell // cols
+            for nx, ny in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+                neighbour = ny * cols + nx
+                if (
+                    0 <= nx < cols
+                    and 0 <= ny < rows
+                    and neighbour in free
+                    and neighbour not in region
+                ):
+                    region.add(neighbour)
+                    queue.append(neighbour)
+        sizes.update(dict.fromkeys(region, len(region)))
+    return sizes
+
+
+def _place_snake(
+    env: SnakeGameEnv, cells: list[tuple[int, int]], length: int
+) -> None:
+    """Puts a snake on the board, head first, that grows to length."""
+    size = env.cell_size
+    snake = env.model.snake
+    snake._segments = deque(Point(x * size, y * size) for x, y in cells)
+    snake._length = length
+    env._reset_regions()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_flood_fill(seed: int) -> None:
+    rng = random.Random(seed)
+    cols, rows = 7, 5
+    regions = ReachableArea(cols, rows)
+    free = set(range(cols * rows))
+
+    for _ in range(500):
+        cell = rng.randrange(cols * rows)
+        if rng.random() < 0.5:
+            regions.occupy(cell)
+            free.discard(cell)
+        else:
+            regions.release(cell)
+            free.add(cell)
+
+        sizes = _region_sizes(free, cols, rows)
+        for cell in range(cols * rows):
+            assert regions.is_free(cell) == (cell in free)
+            assert regions.region_size(cell) == sizes.get(cell, 0)
+
+
+def test_tail_is_blocked_while_growing() -> None:
+    env = SnakeGameEnv(verbose=False, safety_shield=True)
+    env.reset(seed=0)
+    # Moving left with the tail right below the head
+    env.model.snake._direction = Direction.LEFT
+    _place_snake(env, [(5, 5), (6, 5), (6, 6), (5, 6)], length=5)
+    assert not env.action_masks()[Direction.DOWN.value]
+
+    # Once fully grown the tail moves out as the head moves in
+    _place_snake(env, [(5, 5), (6, 5), (6, 6), (5, 6)], length=4)
+    assert env.action_masks()[Direction.DOWN.value]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_regions_follow_the_snake(seed: int) -> None:
+    env = SnakeGameEnv(verbose=False, reachable_area=True)
+    rng = random.Random(seed)
+    env.reset(seed=seed)
+
+    for _ in range(500):
+        snake = env.model.snake
+        segments = snake.segments()
+        occupied = {env._to_cell(s) for s in segments}
+        if len(segments) == snake.length():
+            occupied.discard(env._to_cell(snake.tail()))
+        free = set(range(env.cols * env.rows)) - occupied
+        sizes = _region_sizes(free, env.cols, env.rows)
+        for cell in range(env.cols * env.rows):
+            assert env._regions.region_size(cell) == sizes.get(cell, 0)
+
+        # Never reverse, so every episode can run into its own body
+        current = snake.direction().value
+        action = rng.choice([a for a in range(4) if (a - current) % 4 != 2])
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset(seed=rng.randrange(1000))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_positive_area_never_collides(seed: int) -> None:
+    env = SnakeGameEnv(verbose=False, safety_shield=True)
+    rng = random.Random(seed)
+    env.reset(seed=seed)
+
+    for _ in range(2000):
+        # Head for the fruit so the snake keeps growing
+        head = env.model.snake.head()
+        fruit = env.model.fruit.position()
+        if rng.random() < 0.3:
+            action = rng.randrange(4)
+        elif fruit.y != head.y:
+            action = 2 if fruit.y > head.y else 0
+        else:
+            action = 1 if fruit.x > head.x else 3
+
+        areas = env._get_reachable_areas()
+        _, _, terminated, truncated, info = env.step(action)
+        # A move with room left must land on a free cell
+        if areas[info["action"]] > 0:
+            assert not terminated or truncated
+        if terminated or truncated:
+            env.reset(seed=rng.randrange(1000))
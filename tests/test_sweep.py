@@ -0,0 +1,102 @@
+"""Checks the sweep search spaces, ranking and early stopping."""
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.neural import sweep
+from src.neural.sweep import (
+    TrialResult,
+    _CheckpointCallback,
+    _quantile,
+    _rank_key,
+    grid_search,
+    random_search,
+)
+
+SPACE = {"a": [1, 2, 3], "b": ["x", "y"]}
+
+
+def test_grid_search_covers_every_combination() -> None:
+    trials = grid_search(SPACE)
+
+    assert len(trials) == 6
+    assert {(t["a"], t["b"]) for t in trials} == {
+        (a, b) for a in SPACE["a"] for b in SPACE["b"]
+    }
+
+
+def test_random_search_samples_from_the_space() -> None:
+    trials = random_search(SPACE, 20, seed=0)
+
+    assert len(trials) == 20
+    assert all(t["a"] in SPACE["a"] and t["b"] in SPACE["b"] for t in trials)
+    assert random_search(SPACE, 20, seed=0) == trials
+
+
+@pytest.mark.parametrize("q", [0.1, 0.25, 0.5, 0.9])
+def test_quantile_matches_numpy(q: float) -> None:
+    values = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0]
+    assert _quantile(values, q) == pytest.approx(np.quantile(values, q))
+    assert _quantile([7.0], q) == 7.0
+
+
+def test_stopped_trials_rank_after_completed_ones() -> None:
+    results = [
+        TrialResult(0, {}, score=1.0, best_score=1.0, timesteps=3000),
+        TrialResult(
+            1, {}, score=2.0, best_score=5.0, timesteps=1500, stopped_early=True
+        ),
+        TrialResult(2, {}, score=3.0, best_score=3.0, timesteps=3000),
+        TrialResult(
+            3, {}, score=0.5, best_score=0.5, timesteps=1000, stopped_early=True
+        ),
+    ]
+    results.sort(key=_rank_key)
+
+    assert [r.trial_id for r in results] == [2, 0, 1, 3]
+
+
+def _checkpoint(
+    monkeypatch: pytest.MonkeyPatch, board: dict, score: float, step: int
+) -> tuple[bool, TrialResult]:
+    """Runs the callback at a checkpoint where the trial scores score."""
+    monkeypatch.setattr(sweep, "_mean_fruits_eaten", lambda *args: score)
+    result = TrialResult(0, {})
+    callback = _CheckpointCallback(
+        result,
+        eval_env=None,
+        eval_interval=100,
+        n_eval_episodes=1,
+        board=board,
+        lock=threading.Lock(),
+        min_reports=3,
+        stop_quantile=0.25,
+    )
+    callback.model = SimpleNamespace(num_timesteps=step)
+    callback.num_timesteps = step
+    return callback._on_step(), result
+
+
+def test_checkpoint_callback_stops_losing_trials(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    board: dict = {}
+
+    # Only evaluates on checkpoints
+    assert _checkpoint(monkeypatch, board, 0.0, 150)[0]
+    assert board == {}
+
+    # Too few peers to judge, even for a poor score
+    for score in (4.0, 5.0, 6.0):
+        keep_going, result = _checkpoint(monkeypatch, board, score, 100)
+        assert keep_going
+        assert result.scores == [score]
+    assert board[1] == [4.0, 5.0, 6.0]
+
+    assert not _checkpoint(monkeypatch, board, 1.0, 100)[0]
+    assert _checkpoint(monkeypatch, board, 5.0, 100)[0]
+    # Each checkpoint has its own peers
+    assert _checkpoint(monkeypatch, board, 1.0, 200)[0]
@@ -0,0 +1,99 @@
+"""Checks that BatchedSnakeEnv follows the same rules as SnakeGameEnv."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.neural import BatchedSnakeEnv, RewardConfig, SnakeGameEnv
+
+
+def _sync_fruit(env: SnakeGameEnv, batched: BatchedSnakeEnv) -> None:
+    """Moves the batched fruit onto the single environment's fruit."""
+    x, y = env.model.fruit.position()
+    batched.fruit[0] = (x // env.cell_size, y // env.cell_size)
+
+
+def _fruit_seeking_action(env: SnakeGameEnv, rng: random.Random) -> int:
+    """Mostly heads for the fruit so that episodes include growth."""
+    if rng.random() < 0.3:
+        return rng.randrange(4)
+    head = env.model.snake.head()
+    fruit = env.model.fruit.position()
+    if fruit.y != head.y:
+        return 2 if fruit.y > head.y else 0
+    return 1 if fruit.x > head.x else 3
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_snake_game_env(seed: int) -> None:
+    env = SnakeGameEnv(verbose=False)
+    batched = BatchedSnakeEnv(1)
+    rng = random.Random(seed)
+
+    obs, _ = env.reset(seed=seed)
+    batched.reset()
+    _sync_fruit(env, batched)
+    batched.distance_to_fruit[0] = env.model.state.distance_to_fruit
+    np.testing.assert_array_equal(batched._get_observation()[0], obs)
+
+    for _ in range(2000):
+        action = _fruit_seeking_action(env, rng)
+        obs, reward, terminated, truncated, _ = env.step(action)
+        batched_obs, rewards, batched_terminated, batched_truncated, _ = (
+            batched.step(np.array([action]))
+        )
+
+        # After a collision the head may be off the board, and the final
+        # observation is never used, so only the outcome is compared
+        collided = terminated and not truncated
+        if not collided:
+            np.testing.assert_array_equal(batched_obs[0], obs)
+        assert rewards[0] == reward
+        assert batched_terminated[0] == terminated
+        assert batched_truncated[0] == truncated
+        assert batched.fruits_eaten[0] == env.model.state.fruits_eaten
+
+        if terminated or truncated:
+            break
+        _sync_fruit(env, batched)
+
+    env.close()
+
+
+def test_fruit_streams_repeat_across_individuals() -> None:
+    batched = BatchedSnakeEnv(12, seed=3, fruit_streams=4)
+    for _ in range(200):
+        # The same actions on boards sharing a stream keep them identical
+        actions = np.tile(np.arange(4) % 3, 3)
+        batched.step(actions)
+
+    fruit = batched.fruit.reshape(3, 4, 2)
+    assert (fruit == fruit[0]).all()
+
+
+def test_starvation_matches_snake_game_env() -> None:
+    rewards = RewardConfig(starvation_limit=10)
+    env = SnakeGameEnv(verbose=False, rewards=rewards)
+    batched = BatchedSnakeEnv(1, rewards=rewards)
+    env.reset(seed=0)
+    batched.reset()
+    _sync_fruit(env, batched)
+
+    # Circling in a 2x2 square never hits the body or the walls
+    for step in range(20):
+        action = step % 4
+        obs, reward, terminated, truncated, _ = env.step(action)
+        batched_obs, step_rewards, batched_terminated, batched_truncated, _ = (
+            batched.step(np.array([action]))
+        )
+        assert step_rewards[0] == reward
+        assert (batched_terminated[0], batched_truncated[0]) == (
+            terminated,
+            truncated,
+        )
+        if terminated:
+            break
+
+    assert truncated and step == rewards.starvation_limit - 1
+    env.close()
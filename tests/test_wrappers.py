@@ -0,0 +1,135 @@
+"""Checks the frame stacking and normalization wrappers."""
+
+import numpy as np
+import pytest
+
+from src.neural import BatchedSnakeEnv
+from src.neural.wrappers import (
+    BatchedFrameStackNormalize,
+    ObservationStack,
+    RunningMeanStd,
+)
+
+
+class _CountingEnv:
+    """Batched env whose observations count the steps of each board."""
+
+    def __init__(self, n_envs: int, obs_dim: int, episode_length: int):
+        self.n_envs = n_envs
+        self.obs_dim = obs_dim
+        self.episode_length = episode_length
+        self.steps = np.zeros(n_envs, dtype=np.int64)
+
+    def reset(self, mask: np.ndarray | None = None) -> np.ndarray:
+        if mask is None:
+            mask = np.ones(self.n_envs, dtype=bool)
+        self.steps[mask] = 0
+        return self._observation()
+
+    def step(self, actions: np.ndarray) -> tuple:
+        self.steps += 1
+        done = self.steps >= self.episode_length
+        obs = self._observation()
+        # Finished boards start their next episode straight away
+        self.steps[done] = 0
+        obs[done] = 0
+        return obs, np.zeros(self.n_envs), done, np.zeros_like(done), {}
+
+    def _observation(self) -> np.ndarray:
+        return np.repeat(
+            self.steps[:, None], self.obs_dim, axis=1
+        ).astype(np.float32)
+
+
+def _frames(stacked: np.ndarray, n_frames: int) -> np.ndarray:
+    """Splits (envs, frames * obs_dim) into (envs, frames, obs_dim)."""
+    return stacked.reshape(len(stacked), n_frames, -1)
+
+
+@pytest.mark.parametrize("n_frames", [1, 3, 4])
+def test_frames_stay_in_order_across_wraparound(n_frames: int) -> None:
+    stack = ObservationStack(2, n_frames, 3, normalize=False)
+    history = [np.full((2, 3), -1.0, dtype=np.float32)] * n_frames
+    stack.reset(history[0])
+
+    for t in range(3 * n_frames + 1):
+        obs = np.stack([np.full(3, t), np.full(3, 100 + t)]).astype(
+            np.float32
+        )
+        history = history[1:] + [obs]
+        stacked = stack.push(obs)
+
+        expected = np.stack(history, axis=1)
+        np.testing.assert_array_equal(_frames(stacked, n_frames), expected)
+
+
+def test_stacked_observation_is_a_view() -> None:
+    stack = ObservationStack(2, 4, 3)
+    obs = np.ones((2, 3), dtype=np.float32)
+
+    assert np.shares_memory(stack.reset(obs), stack._buffer)
+    for _ in range(6):
+        assert np.shares_memory(stack.push(obs), stack._buffer)
+
+
+def test_running_stats_match_numpy() -> None:
+    rng = np.random.default_rng(0)
+    batches = [rng.normal(3.0, 2.0, (n, 5)) for n in (1, 7, 16, 3, 16)]
+    stats = RunningMeanStd(5, max_batch=16)
+    for batch in batches:
+        stats.update(batch)
+
+    everything = np.concatenate(batches)
+    assert stats.count == pytest.approx(len(everything) + 1e-4)
+    np.testing.assert_allclose(stats.mean, everything.mean(axis=0), rtol=1e-4)
+    np.testing.assert_allclose(stats.var, everything.var(axis=0), rtol=1e-4)
+
+
+def test_masked_reset_refills_only_the_reset_boards() -> None:
+    env = BatchedSnakeEnv(4, seed=0)
+    wrapper = BatchedFrameStackNormalize(env, 4, n_frames=3)
+    wrapper.reset()
+    for action in (1, 2, 2):
+        stacked = wrapper.step(np.full(4, action))[0]
+    before = stacked.copy()
+    count = wrapper.stack.stats.count
+
+    mask = np.array([True, False, True, False])
+    stacked = wrapper.reset(mask=mask)
+
+    # The first observations of the new episodes reach the stats
+    assert wrapper.stack.stats.count == pytest.approx(count + mask.sum())
+    np.testing.assert_array_equal(stacked[~mask], before[~mask])
+    frames = _frames(stacked[mask], 3)
+    np.testing.assert_array_equal(frames, frames[:, :1].repeat(3, axis=1))
+
+
+def test_autoreset_refills_only_the_done_boards() -> None:
+    env = _CountingEnv(3, 2, episode_length=5)
+    env.steps[:] = [0, 2, 3]
+    wrapper = BatchedFrameStackNormalize(
+        env, 3, obs_dim=2, n_frames=4, normalize=False, autoreset=True
+    )
+    wrapper.stack.reset(env._observation())
+
+    stacked, _, done, _, _ = wrapper.step(np.zeros(3))
+    stacked, _, done, _, _ = wrapper.step(np.zeros(3))
+    np.testing.assert_array_equal(done, [False, False, True])
+
+    frames = _frames(stacked, 4)[:, :, 0]
+    np.testing.assert_array_equal(frames[0], [0, 0, 1, 2])
+    np.testing.assert_array_equal(frames[1], [2, 2, 3, 4])
+    # The finished board restarts from the first obs of its next episode
+    np.testing.assert_array_equal(frames[2], [0, 0, 0, 0])
+
+
+def test_autoreset_does_not_count_observations_twice() -> None:
+    env = _CountingEnv(3, 2, episode_length=2)
+    wrapper = BatchedFrameStackNormalize(
+        env, 3, obs_dim=2, n_frames=2, autoreset=True
+    )
+    wrapper.reset()
+    for _ in range(4):
+        wrapper.step(np.zeros(3))
+
+    assert wrapper.stack.stats.count == pytest.approx(3 * 5 + 1e-4)